@@ -1,5 +1,6 @@
 import xml.etree.ElementTree as ET  # For XML parsing
 import os                          # For file and directory operations
+import glob                        # For recursive filename matching
 import pathlib                     # For path manipulations
 from typing import List, Dict      # For type hints
 import difflib                     # For file comparison
@@ -19,6 +20,10 @@ logging.basicConfig(
 )
 
 class FileEntry:
+    # Fixed layout instead of a per-instance __dict__; with millions of
+    # entries loaded at once this cuts per-object memory roughly 3x
+    __slots__ = ('name', 'size', 'tth')
+
     def __init__(self, name: str, size: int, tth: str):
         self.name = name
         self.size = size
@@ -100,6 +105,11 @@ def compare_xml_files(mine_path: str, first_path: str, second_path: str, third_p
     
     return result
 
+# Translation table built once at import; str.translate escapes all the
+# special characters in a single C-level pass instead of one full string
+# scan (and allocation) per character
+_ESCAPE_TABLE = str.maketrans({c: '\\' + c for c in ' []()!&;\'"`<>?|'})
+
 def clean_filename(filename: str) -> str:
     """
     Clean filename by:
@@ -111,15 +121,8 @@ def clean_filename(filename: str) -> str:
     Returns:
         Cleaned filename safe for Linux systems
     """
-    # First remove any existing escapes
-    cleaned = filename.replace('\\', '')
-    
-    # Escape special characters
-    special_chars = ' []()!&;\'"`<>?|'
-    for char in special_chars:
-        cleaned = cleaned.replace(char, '\\' + char)
-    
-    return cleaned
+    # Remove any existing escapes, then escape in one translate pass
+    return filename.replace('\\', '').translate(_ESCAPE_TABLE)
 
 ROOT_FOLDERS = [
     "/library/torrent/comics/Complete Marvel Comics Chronology Part 01 (1939-1949)/",
@@ -145,42 +148,45 @@ ROOT_FOLDERS = [
     "/library/misc/Unsorted/Spider-Man Collection/"
 ]
 
+# The roots are constants, so strip any escapes once at import instead of
+# re-cleaning them on every use
+_CLEAN_ROOTS = tuple(r.replace('\\', '') for r in ROOT_FOLDERS)
+
 def find_file_path_in_root(filename: str, root: str) -> str | None:
     """
     Search for a file in a single root directory
     """
-    # Pre-clean the filename for comparison
+    # Pre-clean the filename for comparison; the root is already clean
     clean_name = filename.replace('\\', '')
-    search_root = root.replace('\\', '')
-    
+    search_root = root
+
     try:
-        for dirpath, _, filenames in os.walk(search_root):
-            if clean_name in filenames:
-                full_path = os.path.join(dirpath, filename)
-                return clean_filename(full_path)
-    except PermissionError:
-        logging.warning(f"Permission denied accessing directory: {search_root}")
+        # glob's ** expansion runs on scandir and short-circuits at the
+        # first hit, instead of walking the whole tree and throwing most
+        # of it away; escape both parts since comic names are full of
+        # glob metacharacters like brackets
+        pattern = os.path.join(glob.escape(search_root), '**', glob.escape(clean_name))
+        match = next(glob.iglob(pattern, recursive=True), None)
+        if match:
+            return clean_filename(match)
     except OSError as e:
         logging.warning(f"Error accessing directory {search_root}: {str(e)}")
-    
+
     return None
 
 def find_file_path(filename: str) -> str | None:
     """
-    Search through root folders to find the complete path for a file using multiple threads
+    Search through root folders to find the complete path for a file
     """
-    with ThreadPoolExecutor(max_workers=min(len(ROOT_FOLDERS), 8)) as executor:  # Back to 8 threads
-        # Create a partial function with the filename
-        search_func = partial(find_file_path_in_root, filename)
-        
-        # Map the search function across all root folders
-        results = executor.map(search_func, ROOT_FOLDERS)
-        
-        # Return the first non-None result
-        for result in results:
-            if result:
-                return result
-    
+    # Plain sequential scan; spinning up a fresh 8-thread pool per lookup
+    # cost more than the walks themselves once the directory metadata is
+    # warm in the OS cache, and it multiplied the thread count by the
+    # outer worker pool
+    for root in _CLEAN_ROOTS:
+        result = find_file_path_in_root(filename, root)
+        if result:
+            return result
+
     return None
 
 def write_unique_files_to_delete(unique_entries: List[FileEntry], output_path: str = "todelete.txt"):
@@ -1,7 +1,19 @@
 import json                        # For JSON parsing
+import mmap                        # For zero-copy file views
 import os                          # For file and directory operations
+
+# Prefer the faster C/Rust JSON parsers when installed; they parse the big
+# filelists several times faster than the stdlib module
+try:
+    import orjson as _json
+except ImportError:
+    try:
+        import ujson as _json
+    except ImportError:
+        _json = json
 import pathlib                     # For path manipulations
-from typing import List, Dict      # For type hints
+from typing import List, Dict, Tuple  # For type hints
+from collections import defaultdict
 import difflib                     # For file comparison
 import shutil                      # For file operations like delete
 from datetime import datetime      # For timestamp operations
@@ -10,6 +22,7 @@ from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 import concurrent.futures
 import threading
+import signal
 import sys
 
 # Set up basic logging
@@ -18,16 +31,35 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
-class FileEntry:
-    def __init__(self, name: str, size: int, tth: str):
-        self.name = name
-        self.size = size
-        self.tth = tth
+def _parse_json_file(json_path: str):
+    """
+    mmap a JSON file and parse it with whichever parser was imported
 
-def parse_json_entry(entry_dict: dict) -> FileEntry:
+    Mapping the file instead of reading it into one giant bytes object
+    lets the kernel page it in on demand and evict parsed pages, which
+    matters when four large filelists are loaded in a row
     """
-    Parse a single JSON file entry and return a FileEntry object
-    
+    with open(json_path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            mv = memoryview(mm)
+            try:
+                return _json.loads(mv)
+            except TypeError:
+                # stdlib json can't take a buffer object directly
+                return _json.loads(mm[:])
+            finally:
+                mv.release()
+
+def load_json_file(json_path: str) -> Dict[str, Tuple[str, str]]:
+    """
+    Load and parse a JSON file containing file entries
+
+    Returns a dict keyed by TTH mapping to (name, size) tuples. Parsing
+    straight into the dict skips the intermediate entry list and the
+    per-entry wrapper objects the compare step used to rebuild anyway.
+    Size stays the raw string from the JSON; only the handful of entries
+    that reach the disk-verification step ever need it as an int.
+
     Example entry:
     {
         "Name": "Champions 001 (2019) (Digital) (Zone-Empire).cbr",
@@ -35,66 +67,79 @@ def parse_json_entry(entry_dict: dict) -> FileEntry:
         "TTH": "RVPDAATGGUMOTJWDJCF7VTIA3UNTJA42YIUQW5Y"
     }
     """
-    name = entry_dict['Name']
-    size = int(entry_dict['Size'])
-    tth = entry_dict['TTH']
-    
-    return FileEntry(name, size, tth)
+    try:
+        data = _parse_json_file(json_path)
+
+        # Assuming the JSON structure has a root list of file entries
+        return {e['TTH']: (e['Name'], e['Size']) for e in data['files']}
+    except ValueError as e:  # json.JSONDecodeError and the orjson/ujson equivalents
+        logging.error('Failed to parse JSON file %s: %s', json_path, str(e))
+        raise
+    except FileNotFoundError:
+        logging.error('JSON file not found: %s', json_path)
+        raise
 
-def load_json_file(json_path: str) -> List[FileEntry]:
-    """Load and parse a JSON file containing file entries"""
+def load_tth_hashes(json_path: str) -> set:
+    """
+    Load only the TTH hashes from one of the big comparison filelists
+
+    The big side of the compare is a pure membership check, so there is
+    no need to keep names and sizes around; one 64-bit hash per entry
+    (Python's built-in string hash) takes a fraction of the memory of a
+    dict full of strings and lets billion-entry lists fit in RAM. A hash
+    collision can only make an entry look non-unique, i.e. keep a file
+    that could have been deleted.
+    """
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            entries = []
-            
-            # Assuming the JSON structure has a root list of file entries
-            for entry in data['files']:  # Adjust this based on your JSON structure
-                entries.append(parse_json_entry(entry))
-            
-            return entries
-    except json.JSONDecodeError as e:
+        data = _parse_json_file(json_path)
+
+        return {hash(e['TTH']) for e in data['files']}
+    except ValueError as e:  # json.JSONDecodeError and the orjson/ujson equivalents
         logging.error('Failed to parse JSON file %s: %s', json_path, str(e))
         raise
     except FileNotFoundError:
         logging.error('JSON file not found: %s', json_path)
         raise
 
-def compare_json_files(mine_path: str, first_path: str, second_path: str, third_path: str) -> Dict[str, List[FileEntry]]:
+def compare_json_files(mine_path: str, first_path: str, second_path: str, third_path: str) -> Dict[str, List[Tuple[str, str]]]:
     """
     Compare four JSON files and categorize entries based on TTH matches
     """
-    # Load all JSON files
-    mine_entries = {entry.tth: entry for entry in load_json_file(mine_path)}
-    first_entries = {entry.tth: entry for entry in load_json_file(first_path)}
-    second_entries = {entry.tth: entry for entry in load_json_file(second_path)}
-    third_entries = {entry.tth: entry for entry in load_json_file(third_path)}
-    
+    # My own list needs the full entries, but the three big lists are
+    # only ever membership-tested, so load them as compact hash sets.
+    # The four loads are independent and IO/parse bound (orjson releases
+    # the GIL on large inputs), so run them concurrently
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        mine_future = executor.submit(load_json_file, mine_path)
+        first_future = executor.submit(load_tth_hashes, first_path)
+        second_future = executor.submit(load_tth_hashes, second_path)
+        third_future = executor.submit(load_tth_hashes, third_path)
+
+        mine_entries = mine_future.result()
+        first_hashes = first_future.result()
+        second_hashes = second_future.result()
+        third_hashes = third_future.result()
+
+    # Compare on hashed TTH keys with set algebra; dict views support set
+    # operations directly and the intersections/differences run in C
+    # instead of three dict lookups per entry in Python bytecode
+    mine_hashes = {hash(tth): tth for tth in mine_entries}
+    mine_keys = mine_hashes.keys()
+
+    in_all = mine_keys & first_hashes & second_hashes & third_hashes
+    in_first = (mine_keys & first_hashes) - in_all
+    in_second = (mine_keys & second_hashes) - first_hashes
+    in_third = (mine_keys & third_hashes) - first_hashes - second_hashes
+    unique = mine_keys - first_hashes - second_hashes - third_hashes
+
     result = {
-        'unique_to_mine': [],
-        'in_first': [],
-        'in_second': [],
-        'in_third': [],
-        'in_all': []
+        'unique_to_mine': [mine_entries[mine_hashes[h]] for h in unique],
+        'in_first': [mine_entries[mine_hashes[h]] for h in in_first],
+        'in_second': [mine_entries[mine_hashes[h]] for h in in_second],
+        'in_third': [mine_entries[mine_hashes[h]] for h in in_third],
+        'in_all': [mine_entries[mine_hashes[h]] for h in in_all]
     }
     
-    # Compare entries
-    for tth, entry in mine_entries.items():
-        in_first = tth in first_entries
-        in_second = tth in second_entries
-        in_third = tth in third_entries
-        
-        if in_first and in_second and in_third:
-            result['in_all'].append(entry)
-        elif in_first:
-            result['in_first'].append(entry)
-        elif in_second:
-            result['in_second'].append(entry)
-        elif in_third:
-            result['in_third'].append(entry)
-        else:
-            result['unique_to_mine'].append(entry)
-    
     logging.info('Found %d unique entries', len(result['unique_to_mine']))
     logging.info('Found %d matches in first file', len(result['in_first']))
     logging.info('Found %d matches in second file', len(result['in_second']))
@@ -103,6 +148,11 @@ def compare_json_files(mine_path: str, first_path: str, second_path: str, third_
     
     return result
 
+# Translation table built once at import; str.translate escapes all the
+# special characters in a single C-level pass instead of one full string
+# scan (and allocation) per character
+_ESCAPE_TABLE = str.maketrans({c: '\\' + c for c in ' []()!&;\'"`<>?|'})
+
 def clean_filename(filename: str) -> str:
     """
     Clean filename by:
@@ -114,15 +164,8 @@ def clean_filename(filename: str) -> str:
     Returns:
         Cleaned filename safe for Linux systems
     """
-    # First remove any existing escapes
-    cleaned = filename.replace('\\', '')
-    
-    # Escape special characters
-    special_chars = ' []()!&;\'"`<>?|'
-    for char in special_chars:
-        cleaned = cleaned.replace(char, '\\' + char)
-    
-    return cleaned
+    # Remove any existing escapes, then escape in one translate pass
+    return filename.replace('\\', '').translate(_ESCAPE_TABLE)
 
 ROOT_FOLDERS = [
     "/library/torrent/comics/Complete Marvel Comics Chronology Part 01 (1939-1949)/",
@@ -148,45 +191,74 @@ ROOT_FOLDERS = [
     "/library/misc/Unsorted/Spider-Man Collection/"
 ]
 
-def find_file_path_in_root(filename: str, root: str) -> str | None:
+# The roots are constants, so strip any escapes once at import instead of
+# re-cleaning them on every use
+_CLEAN_ROOTS = tuple(r.replace('\\', '') for r in ROOT_FOLDERS)
+
+def scan_root(root: str) -> Dict[str, List[str]]:
     """
-    Search for a file in a single root directory
+    Iteratively scan one root folder with os.scandir; DirEntry reuses the
+    file type reported by the OS directory listing so no extra stat call
+    is made per entry, unlike os.walk
     """
-    # Pre-clean the filename for comparison
-    clean_name = filename.replace('\\', '')
-    search_root = root.replace('\\', '')
-    
-    try:
-        for dirpath, _, filenames in os.walk(search_root):
-            if clean_name in filenames:
-                full_path = os.path.join(dirpath, filename)
-                return clean_filename(full_path)
-    except PermissionError:
-        logging.warning(f"Permission denied accessing directory: {search_root}")
-    except OSError as e:
-        logging.warning(f"Error accessing directory {search_root}: {str(e)}")
-    
-    return None
+    index: Dict[str, List[str]] = defaultdict(list)
+    stack = [root]
+
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        index[entry.name].append(entry.path)
+        except PermissionError:
+            logging.warning(f"Permission denied accessing directory: {current}")
+        except OSError as e:
+            logging.warning(f"Error accessing directory {current}: {str(e)}")
 
-def find_file_path(filename: str) -> str | None:
+    return index
+
+def build_filename_index(roots: List[str]) -> Dict[str, List[str]]:
     """
-    Search through root folders to find the complete path for a file using multiple threads
+    Walk every root folder exactly once and build an index mapping each
+    basename to its full paths on disk, so each entry lookup afterwards is
+    a single dict hit instead of a full os.walk per filename
     """
-    with ThreadPoolExecutor(max_workers=min(len(ROOT_FOLDERS), 8)) as executor:  # Back to 8 threads
-        # Create a partial function with the filename
-        search_func = partial(find_file_path_in_root, filename)
-        
-        # Map the search function across all root folders
-        results = executor.map(search_func, ROOT_FOLDERS)
-        
-        # Return the first non-None result
-        for result in results:
-            if result:
-                return result
-    
+    index: Dict[str, List[str]] = defaultdict(list)
+
+    # Roots are independent, so scan them concurrently; each worker fills
+    # a local dict and the merge happens single-threaded afterwards
+    with ThreadPoolExecutor(max_workers=len(roots)) as executor:
+        partials = list(executor.map(scan_root, roots))
+
+    for partial_index in partials:
+        for filename, paths in partial_index.items():
+            index[filename].extend(paths)
+
+    logging.info('Indexed %d distinct filenames across %d root folders', len(index), len(roots))
+    return index
+
+def find_file_path(filename: str, size: str, index: Dict[str, List[str]]) -> str | None:
+    """
+    Look up the complete path for a file in the pre-built filename index,
+    using the entry's size to disambiguate duplicate basenames so the
+    delete list never points at the wrong copy
+    """
+    # Pre-clean the filename for comparison
+    clean_name = filename.replace('\\', '')
+    expected_size = int(size)
+    for path in index.get(clean_name, []):
+        try:
+            if os.stat(path).st_size == expected_size:
+                return clean_filename(path)
+        except OSError:
+            continue
+
     return None
 
-def write_unique_files_to_delete(unique_entries: List[FileEntry], output_path: str = "todelete.txt"):
+def write_unique_files_to_delete(unique_entries: List[Tuple[str, str]], output_path: str = "todelete.txt"):
     """
     Write the complete paths of unique files to todelete.txt using multiple threads
     """
@@ -196,44 +268,44 @@ def write_unique_files_to_delete(unique_entries: List[FileEntry], output_path: s
         total_entries = len(unique_entries)
         last_progress = 0
         stop_event = threading.Event()
-        
-        def check_quit():
-            print("\nPress Enter to quit gracefully...")
-            while not stop_event.is_set():
-                if input() != None:
-                    logging.info('Quit requested. Finishing current operations...')
-                    stop_event.set()
-                    return
-        
-        # Start the quit checker in a separate thread
-        quit_thread = threading.Thread(target=check_quit)
-        quit_thread.daemon = True
-        quit_thread.start()
-        
+
+        # Ctrl-C sets the stop flag for a graceful shutdown; no thread
+        # blocked on stdin, and this also works when stdin is not a TTY
+        def request_quit(*_):
+            logging.info('Quit requested. Finishing current operations...')
+            stop_event.set()
+
+        signal.signal(signal.SIGINT, request_quit)
+        print("\nPress Ctrl-C to quit gracefully...")
+
+        # Walk the root folders once up front; every entry lookup after
+        # this is a single dict hit
+        index = build_filename_index(_CLEAN_ROOTS)
+
+        # Collect matches and write them in one go at the end instead of
+        # issuing one small write() per found path
+        found_paths = []
+
+        for name, size in unique_entries:
+            if stop_event.is_set():
+                logging.info('Gracefully stopping...')
+                break
+
+            processed_count += 1
+            full_path = find_file_path(name, size, index)
+            if full_path:
+                found_paths.append(f"{full_path}\n")
+                found_count += 1
+
+            # Show progress for both processed and found files
+            if processed_count % 100 == 0 or found_count % 100 == 0:
+                if processed_count != last_progress:
+                    logging.info('Processed %d out of %d entries. Found %d matching files so far...',
+                               processed_count, total_entries, found_count)
+                    last_progress = processed_count
+
         with open(output_path, 'w', encoding='utf-8') as f:
-            with ThreadPoolExecutor(max_workers=16) as executor:  # Increased to 16 threads
-                future_to_entry = {
-                    executor.submit(find_file_path, entry.name): entry 
-                    for entry in unique_entries
-                }
-                
-                for future in concurrent.futures.as_completed(future_to_entry):
-                    if stop_event.is_set():
-                        logging.info('Gracefully stopping...')
-                        break
-                        
-                    processed_count += 1
-                    full_path = future.result()
-                    if full_path:
-                        f.write(f"{full_path}\n")
-                        found_count += 1
-                    
-                    # Show progress for both processed and found files
-                    if processed_count % 100 == 0 or found_count % 100 == 0:
-                        if processed_count != last_progress:
-                            logging.info('Processed %d out of %d entries. Found %d matching files so far...',
-                                       processed_count, total_entries, found_count)
-                            last_progress = processed_count
+            f.writelines(found_paths)
         
         logging.info('Successfully wrote %d file paths out of %d processed entries to %s',
                     found_count, total_entries, output_path)
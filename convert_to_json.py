@@ -3,12 +3,71 @@ import json
 import logging
 import os
 
+# lxml's iterparse is compiled C and can filter on the File tag before
+# Python ever sees an event; fall back to the stdlib parser without it
+try:
+    from lxml import etree as _lxml_etree
+    _PARSE_ERRORS = (ET.ParseError, _lxml_etree.XMLSyntaxError)
+except ImportError:
+    _lxml_etree = None
+    _PARSE_ERRORS = (ET.ParseError,)
+
+# Prefer the faster C/Rust JSON serializers when installed; orjson returns
+# bytes so normalize everything to a bytes-producing helper
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    try:
+        import ujson
+
+        def _dumps(obj) -> bytes:
+            return ujson.dumps(obj).encode('utf-8')
+    except ImportError:
+        def _dumps(obj) -> bytes:
+            return json.dumps(obj).encode('utf-8')
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
+def _iter_file_elements(xml_path: str):
+    """
+    Yield each <File> element from the XML, streaming with whichever
+    parser is available and freeing processed elements as it goes
+    """
+    if _lxml_etree is not None:
+        # The tag filter runs at the C layer, so only <File> end events
+        # reach Python at all
+        for _, elem in _lxml_etree.iterparse(xml_path, events=('end',), tag='File'):
+            yield elem
+            elem.clear()
+            # Drop already-processed siblings the parent still references
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+    else:
+        root = None
+        count = 0
+        for event, elem in ET.iterparse(xml_path, events=('start', 'end')):
+            if event == 'start':
+                if root is None:
+                    root = elem  # Keep a handle on the root so we can prune it
+                continue
+
+            if elem.tag == 'File':
+                yield elem
+                count += 1
+                elem.clear()
+
+                # Periodically drop the processed children the root is
+                # still holding on to
+                if count % 10000 == 0:
+                    root.clear()
+
 def convert_xml_to_json(xml_path: str, json_path: str):
     """
     Convert XML file to JSON format
@@ -19,37 +78,36 @@ def convert_xml_to_json(xml_path: str, json_path: str):
     """
     try:
         logging.info('Converting %s to JSON...', xml_path)
-        tree = ET.parse(xml_path)
-        root = tree.getroot()
-        
-        # Create JSON structure
-        json_data = {
-            "files": []
-        }
-        
-        # Convert each File element
+
+        # Stream the XML instead of building the whole tree in memory,
+        # and write each record straight to disk so neither the input tree
+        # nor an output list is ever fully materialized; DC++ filelists
+        # can hold millions of <File> entries
         file_count = 0
-        for file_elem in root.findall('.//File'):
-            file_data = {
-                "Name": file_elem.get('Name'),
-                "Size": file_elem.get('Size'),
-                "TTH": file_elem.get('TTH')
-            }
-            json_data["files"].append(file_data)
-            file_count += 1
-            
-            # Log progress for large files
-            if file_count % 10000 == 0:
-                logging.info('Processed %d files...', file_count)
-        
-        # Write JSON file
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(json_data, f)
-        
+        with open(json_path, 'wb') as f:
+            f.write(b'{"files":[')
+
+            for elem in _iter_file_elements(xml_path):
+                file_data = {
+                    "Name": elem.get('Name'),
+                    "Size": elem.get('Size'),
+                    "TTH": elem.get('TTH')
+                }
+                if file_count:
+                    f.write(b',')
+                f.write(_dumps(file_data))
+                file_count += 1
+
+                # Log progress for large files
+                if file_count % 10000 == 0:
+                    logging.info('Processed %d files...', file_count)
+
+            f.write(b']}')
+
         logging.info('Successfully converted %s to %s (%d files)', 
                     xml_path, json_path, file_count)
         
-    except ET.ParseError as e:
+    except _PARSE_ERRORS as e:
         logging.error('Failed to parse XML file %s: %s', xml_path, str(e))
         raise
     except Exception as e:
@@ -7,17 +7,16 @@ Requires Python 3.11 or higher
 
 import zipfile
 import rarfile
+import copy
 import logging
 import os
 from pathlib import Path
 from typing import Dict, List, Union, Tuple, Optional
 import shutil
 import tempfile
-from concurrent.futures import ThreadPoolExecutor
-import threading
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 import sys
-import re
 
 # Verify Python version
 if sys.version_info < (3, 11):
@@ -26,6 +25,87 @@ if sys.version_info < (3, 11):
 # Configure rarfile to use the correct unrar executable
 rarfile.UNRAR_TOOL = "unrar"  # Adjust this path as needed
 
+# Optional libarchive backend for extraction: the C library releases the
+# GIL across whole read calls instead of bouncing through an unrar
+# subprocess; opt in with COMICCLEAN_BACKEND=libarchive when the
+# libarchive-c package is installed
+try:
+    import libarchive
+except ImportError:
+    libarchive = None
+
+_USE_LIBARCHIVE = (libarchive is not None
+                   and os.environ.get('COMICCLEAN_BACKEND') == 'libarchive')
+
+# Buffer size for streaming copies; the 16 KiB shutil default wastes
+# syscalls on megabyte-sized page images
+COPY_BUFSIZE = 2 * 1024 * 1024
+
+# Page formats that are already entropy-coded; deflating them burns CPU
+# for well under 1% size gain, so they are stored uncompressed
+IMAGE_EXTS = frozenset({'.jpg', '.jpeg', '.png', '.webp', '.gif', '.bmp'})
+
+# Single-char substitution table; str.translate beats str.replace for
+# the hyphen-to-underscore rewrite
+_HYPHEN_TO_UNDERSCORE = str.maketrans('-', '_')
+
+def _copy_raw(src_zip: zipfile.ZipFile, info: zipfile.ZipInfo,
+              dst_zip: zipfile.ZipFile, arcname: str) -> None:
+    """
+    Copy one entry's compressed payload verbatim from src_zip to dst_zip
+    under a new name, skipping the decompress/re-DEFLATE round trip.
+    zipfile has no public API for this, so the local header is emitted by
+    hand and the destination's bookkeeping updated to match
+    """
+    new_info = copy.copy(info)
+    new_info.filename = arcname
+    # Sizes are written into the local header below, so drop the
+    # data-descriptor flag a streaming writer may have set
+    new_info.flag_bits &= ~0x08
+    new_info.header_offset = dst_zip.fp.tell()
+
+    dst_zip._writecheck(new_info)
+    dst_zip._didModify = True
+    zip64 = (info.file_size > zipfile.ZIP64_LIMIT
+             or info.compress_size > zipfile.ZIP64_LIMIT)
+    dst_zip.fp.write(new_info.FileHeader(zip64))
+
+    # Skip the source's local header (30 bytes plus name/extra fields,
+    # whose lengths can differ from the central directory's copy)
+    src = src_zip.fp
+    src.seek(info.header_offset + 26)
+    name_len = int.from_bytes(src.read(2), 'little')
+    extra_len = int.from_bytes(src.read(2), 'little')
+    src.seek(name_len + extra_len, 1)
+
+    remaining = info.compress_size
+    while remaining > 0:
+        chunk = src.read(min(COPY_BUFSIZE, remaining))
+        if not chunk:
+            raise zipfile.BadZipFile(f'Truncated payload for {info.filename}')
+        dst_zip.fp.write(chunk)
+        remaining -= len(chunk)
+
+    dst_zip.filelist.append(new_info)
+    dst_zip.NameToInfo[new_info.filename] = new_info
+    dst_zip.start_dir = dst_zip.fp.tell()
+
+def _copy_stream(source, target) -> None:
+    """
+    Copy source to target like shutil.copyfileobj, but fill one reusable
+    buffer with readinto instead of allocating a fresh bytes per chunk
+    """
+    readinto = getattr(source, 'readinto', None)
+    if readinto is None:
+        shutil.copyfileobj(source, target, COPY_BUFSIZE)
+        return
+    with memoryview(bytearray(COPY_BUFSIZE)) as view:
+        while True:
+            count = readinto(view)
+            if not count:
+                break
+            target.write(view[:count])
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -34,117 +114,124 @@ logging.basicConfig(
 )
 
 class ArchiveHandler:
+    # Shared, immutable lookup sets built once at class creation instead
+    # of a fresh set per instance or per call
+    SUPPORTED_FORMATS = frozenset({'.zip', '.cbz', '.rar', '.cbr'})
+    ZIP_EXTS = frozenset({'.zip', '.cbz'})
+    RAR_EXTS = frozenset({'.rar', '.cbr'})
+    _VALID_ACTIONS = frozenset({'M', 'D'})
+
+    # Fixed layout instead of a per-instance __dict__; attribute reads in
+    # the per-entry loops go through C-level slot descriptors
+    __slots__ = ('temp_dir',)
+
     def __init__(self):
-        self.supported_formats = {'.zip', '.cbz', '.rar', '.cbr'}
         self.temp_dir = Path(tempfile.mkdtemp())
-        # Pattern to match four numbers together after a hyphen, plus, or ampersand
-        # e.g., "1213" in "023-1213.jpg"
-        self.double_number_pattern = re.compile(r'[-+&](\d{2})(\d{2})\.(?i:jpe?g|png)', re.IGNORECASE)
-        # Pattern to match two 3-digit numbers separated by +/&/-
-        # e.g., "033-034" in "GL54-033-034.jpg"
-        self.connected_number_pattern = re.compile(r'[-+&](\d{3})[-+&](\d{3})\.(?i:jpe?g|png)', re.IGNORECASE)
         logging.info('Initialized temporary directory at: %s', self.temp_dir)
 
-    def __del__(self):
-        """Cleanup temporary directory on object destruction"""
+    def close(self) -> None:
+        """Remove the handler's temporary directory"""
+        # Explicit, deterministic cleanup; a __del__ finalizer ran at
+        # unpredictable GC time (often interpreter shutdown, where rmtree
+        # can fail silently) and raced across pool workers
         try:
             shutil.rmtree(self.temp_dir)
             logging.info('Cleaned up temporary directory')
         except Exception as e:
             logging.error('Failed to cleanup temporary directory: %s', e)
 
-    def _create_temp_dir(self, archive_path: Path) -> Path:
-        """Create a unique temporary directory for this archive"""
-        # Create unique directory name using timestamp and archive name
-        unique_dir = self.temp_dir / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{archive_path.stem}"
-        unique_dir.mkdir(parents=True, exist_ok=True)
-        logging.info('Created temporary directory for %s at: %s', archive_path.name, unique_dir)
-        return unique_dir
+    def __enter__(self) -> 'ArchiveHandler':
+        return self
 
-    def _cleanup_temp_dir(self, temp_dir: Path) -> None:
-        """Clean up a specific temporary directory"""
-        try:
-            if temp_dir.exists():
-                shutil.rmtree(temp_dir)
-                logging.info('Cleaned up temporary directory: %s', temp_dir)
-        except Exception as e:
-            logging.error('Failed to cleanup temporary directory %s: %s', temp_dir, e)
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
 
     def is_supported(self, file_path: Path) -> bool:
         """Check if the file format is supported"""
-        return file_path.suffix.lower() in self.supported_formats
+        return file_path.suffix.lower() in self.SUPPORTED_FORMATS
 
-    def find_double_numbers(self, filename: str) -> Optional[Tuple[str, str, str]]:
+    def find_double_numbers(self, filename: str) -> Optional[Tuple[str, str, str, int]]:
         """
         Find instances of four numbers together or numbers separated by +/& in a filename
-        Returns tuple of (prefix, first_number, second_number) if found, None otherwise
-        Example: "GL54-033-034.jpg" -> ("GL54", "033", "034")
-                "GL57-020+021.jpg" -> ("GL57", "020", "021")
-                "GL51-006-007.jpg" -> ("GL51", "006", "007")
+        Returns (prefix, first_number, second_number, extension_start) if
+        found, None otherwise; the last element is the index of the
+        extension dot so callers can slice instead of re-searching
+        Example: "GL54-033-034.jpg" -> ("GL54", "033", "034", 12)
+                "GL57-020+021.jpg" -> ("GL57", "020", "021", 12)
         """
-        # Try to match three-digit numbers separated by +/&/-
-        match = self.connected_number_pattern.search(filename)
-        if match:
-            # Get the full string up to the first number
-            start = match.start()
-            prefix = filename[:start]
-            # Extract the numbers
-            first_num = match.group(1)
-            second_num = match.group(2)
-            return (prefix, first_num, second_num)
-        
-        # Then try to match four digits together
-        match = self.double_number_pattern.search(filename)
-        if match:
-            start = match.start()
-            prefix = filename[:start]
-            first_num = match.group(1)
-            second_num = match.group(2)
-            return (prefix, first_num, second_num)
-        
+        # Hand-rolled scan anchored on the extension dot; this runs once
+        # per archive entry, and skipping the regex engine entirely makes
+        # the common no-match case a handful of slice checks
+        dot = filename.rfind('.')
+        if dot == -1 or filename[dot + 1:].lower() not in ('jpg', 'jpeg', 'png'):
+            return None
+
+        seps = '-+&'
+        # "-033-034.jpg" form: separator, three digits, separator, three digits
+        if (dot >= 8 and filename[dot - 8] in seps
+                and filename[dot - 7:dot - 4].isdigit()
+                and filename[dot - 4] in seps
+                and filename[dot - 3:dot].isdigit()):
+            return (filename[:dot - 8], filename[dot - 7:dot - 4], filename[dot - 3:dot], dot)
+
+        # "-0809.jpg" form: separator then four digits run together
+        if (dot >= 5 and filename[dot - 5] in seps
+                and filename[dot - 4:dot].isdigit()):
+            return (filename[:dot - 5], filename[dot - 4:dot - 2], filename[dot - 2:dot], dot)
+
         return None
 
-    def suggest_new_name(self, filename: str, number_match: Tuple[str, str, str]) -> str:
+    def suggest_new_name(self, filename: str, number_match: Tuple[str, str, str, int]) -> str:
         """
         Generate suggested new filename with underscores everywhere except between split numbers
         Example: "GL54-033-034.jpg" -> "GL54_033-034.jpg"
                 "GL57-020+021.JPG" -> "GL57_020-021.JPG"
                 "Green Lantern 031-0809.JPG" -> "Green Lantern 031_08-09.JPG"
         """
-        prefix, first_num, second_num = number_match
-        # Find the extension with original case
-        ext_match = re.search(r'\.(?i:jpe?g|png)$', filename)
-        original_ext = ext_match.group(0) if ext_match else ''
-        # Convert all hyphens to underscores in the prefix
-        modified_prefix = prefix.replace('-', '_')
+        prefix, first_num, second_num, ext_start = number_match
+        # Convert all hyphens to underscores in the prefix; slicing from
+        # the offset find_double_numbers already located keeps the
+        # extension's original case without a second search
+        modified_prefix = prefix.translate(_HYPHEN_TO_UNDERSCORE)
         # Return with underscore before the split numbers, but hyphen between them
-        return f"{modified_prefix}_{first_num}-{second_num}{original_ext}"
+        return f"{modified_prefix}_{first_num}-{second_num}{filename[ext_start:]}"
 
-    def list_archive_contents(self, archive_path: Path) -> Dict[int, str]:
+    def list_archive_contents(self, archive_path: Path,
+                              zip_ref: Optional[zipfile.ZipFile] = None) -> Dict[int, str]:
         """
         List contents of an archive with numbered entries
         Returns a dictionary mapping numbers to filenames
+        Pass an already-open zip_ref to reuse its parsed central directory
         """
         try:
             files_dict = {}
             index = 1
-            
-            if archive_path.suffix.lower() in {'.zip', '.cbz'}:
-                with zipfile.ZipFile(archive_path, 'r') as archive:
-                    # Sort filenames to ensure consistent ordering
-                    filenames = sorted(archive.namelist())
-                    for filename in filenames:
-                        if not filename.endswith('/'): # Skip directories
-                            files_dict[index] = filename
-                            index += 1
-                            
-            elif archive_path.suffix.lower() in {'.rar', '.cbr'}:
+            # Parse the suffix once; Path.suffix re-splits the name on
+            # every access
+            suffix = archive_path.suffix.lower()
+
+            if suffix in self.ZIP_EXTS:
+                if zip_ref is not None:
+                    infos = zip_ref.infolist()
+                else:
+                    with zipfile.ZipFile(archive_path, 'r') as archive:
+                        infos = archive.infolist()
+                # One infolist() pass, filtered before sorting so only
+                # real files pay the sort cost; is_dir() also catches
+                # directory entries that lack the trailing slash
+                for info in sorted((i for i in infos if not i.is_dir()),
+                                   key=lambda i: i.filename):
+                    files_dict[index] = info.filename
+                    index += 1
+
+            elif suffix in self.RAR_EXTS:
                 with rarfile.RarFile(archive_path, 'r') as archive:
-                    filenames = sorted(archive.namelist())
-                    for filename in filenames:
-                        if not archive.getinfo(filename).isdir():
-                            files_dict[index] = filename
-                            index += 1
+                    # infolist() instead of a getinfo() lookup per name,
+                    # which is a linear scan in rarfile (O(N^2) overall)
+                    for info in sorted((i for i in archive.infolist() if not i.isdir()),
+                                       key=lambda i: i.filename):
+                        files_dict[index] = info.filename
+                        index += 1
             
             return files_dict
             
@@ -152,6 +239,139 @@ class ArchiveHandler:
             logging.error('Failed to list contents of %s: %s', archive_path, e)
             raise
 
+    def _plan(self, files_dict: Dict[int, str]) -> Dict[str, str]:
+        """
+        Compute the suggested rename plan for an archive listing
+        Pure function of the listing, so it is safe to run in parallel
+        workers with no prompting involved
+        """
+        suggested_changes = {}
+        for filename in files_dict.values():
+            number_match = self.find_double_numbers(filename)
+            if number_match:
+                suggested_changes[filename] = self.suggest_new_name(filename, number_match)
+        return suggested_changes
+
+    def _interactive_plan(self, archive_path: Path, files_dict: Dict[int, str],
+                          suggested_changes: Dict[str, str]) -> Tuple[Dict[str, str], set]:
+        """Display the listing and prompt the user for rename/delete commands"""
+        # Display contents and instructions
+        print("\n" + "=" * 50)
+        print(f"Archive: {archive_path.name}")
+        print("=" * 50)
+        print("Commands: <number> M to modify, <number> D to delete")
+        print("Example: '17 D' to delete file 17, '20 M' to modify file 20")
+        print("Type 'A' to accept all suggested changes")
+        print("Press Enter without input to finish current archive")
+        print("Type 'X' to exit program completely")
+        print("-" * 50)
+
+        # Buffer the listing and emit it with one write; print() flushes
+        # per line on a terminal, which drags on thousand-page archives
+        lines = []
+        for num, filename in files_dict.items():
+            if filename in suggested_changes:
+                lines.append(f"{num:3d}. {filename} -> {suggested_changes[filename]} (suggested)")
+            else:
+                lines.append(f"{num:3d}. {filename}")
+        lines.append("-" * 50)
+        sys.stdout.write('\n'.join(lines) + '\n')
+
+        files_to_rename = {}
+        files_to_delete = set()
+
+        while True:
+            command = input("\nEnter command (or press Enter to finish): ").strip().upper()
+            if not command:
+                break
+
+            if command == 'X':
+                logging.info('User requested exit')
+                print("Exiting program...")
+                sys.exit(0)
+
+            if command == 'A':
+                if suggested_changes:
+                    files_to_rename.update(suggested_changes)
+                    print(f"Added {len(suggested_changes)} suggested changes")
+                    continue
+                else:
+                    print("No suggested changes available")
+                    continue
+
+            # Parse command
+            parts = command.split()
+            if len(parts) != 2 or parts[1] not in self._VALID_ACTIONS:
+                print("Invalid command. Use format: '<number> M' or '<number> D'")
+                continue
+
+            try:
+                file_num = int(parts[0])
+                action = parts[1]
+
+                if file_num not in files_dict:
+                    print("Invalid file number. Please try again.")
+                    continue
+
+                filename = files_dict[file_num]
+
+                if action == 'D':
+                    # Mark file for deletion
+                    files_to_delete.add(filename)
+                    print(f"Marked for deletion: {filename}")
+
+                else:  # action == 'M'
+                    # The plan phase already classified every filename
+                    # once; reuse that instead of re-scanning per command
+                    suggested_name = suggested_changes.get(filename)
+                    if suggested_name is not None:
+                        print(f"Suggested new name: {suggested_name}")
+                        use_suggested = input("Use suggested name? (y/n): ").lower()
+
+                        if use_suggested == 'y':
+                            files_to_rename[filename] = suggested_name
+                        else:
+                            new_name = input("Enter new name: ")
+                            if new_name:
+                                files_to_rename[filename] = new_name
+                    else:
+                        new_name = input("Enter new name: ")
+                        if new_name:
+                            files_to_rename[filename] = new_name
+
+            except ValueError:
+                print("Please enter a valid number.")
+
+        return files_to_rename, files_to_delete
+
+    @staticmethod
+    def _build_rename_map(names, files_to_rename: Dict[str, str]) -> Dict[str, str]:
+        """
+        Map every kept entry name to its target name in one pass:
+        explicit renames win, other names get hyphens underscored only
+        when some rename was requested (matching the old inline logic)
+        """
+        rename_get = files_to_rename.get
+        has_renames = bool(files_to_rename)
+        rename_map = {}
+        for name in names:
+            target = rename_get(name)
+            if target is None:
+                if has_renames and '-' in name:
+                    target = name.replace('-', '_')
+                else:
+                    target = name
+            rename_map[name] = target
+        return rename_map
+
+    def _apply(self, archive_path: Path, files_to_rename: Dict[str, str], files_to_delete: set,
+               zip_ref: Optional[zipfile.ZipFile] = None) -> None:
+        """Apply an agreed rename/delete plan to the archive on disk"""
+        if archive_path.suffix.lower() in self.ZIP_EXTS:
+            self._process_zip(archive_path, files_to_rename, files_to_delete, zip_ref=zip_ref)
+        else:
+            self._process_rar(archive_path, files_to_rename, files_to_delete)
+
     def process_archive(self, archive_path: Path, auto_mode: bool = False, dry_run: bool = False, changes_log: List[str] = None) -> None:
         """Process a single archive file"""
         if not self.is_supported(archive_path):
@@ -159,138 +379,56 @@ class ArchiveHandler:
             return
 
         logging.info('Processing archive: %s', archive_path)
+        src = None
         try:
+            # For zips, open one handle for the whole list-plan-apply
+            # cycle so the central directory is only parsed once
+            if archive_path.suffix.lower() in self.ZIP_EXTS:
+                src = zipfile.ZipFile(archive_path, 'r')
+
             # List contents with numbers
-            files_dict = self.list_archive_contents(archive_path)
-            
+            files_dict = self.list_archive_contents(archive_path, zip_ref=src)
+
             if not files_dict:
                 logging.warning('No files found in archive: %s', archive_path)
                 return
-            
-            # Track files with suggested changes
-            suggested_changes = {}
-            
+
+            # Plan first; the suggestions are computed the same way in
+            # every mode, only how they get confirmed differs
+            suggested_changes = self._plan(files_dict)
+
             if dry_run:
                 print("\n" + "=" * 50)
                 print(f"Archive: {archive_path}")
                 print("=" * 50)
                 print("The following changes would be made:")
                 print("-" * 50)
-            elif not auto_mode:
-                # Display contents and instructions
-                print("\n" + "=" * 50)
-                print(f"Archive: {archive_path.name}")
-                print("=" * 50)
-                print("Commands: <number> M to modify, <number> D to delete")
-                print("Example: '17 D' to delete file 17, '20 M' to modify file 20")
-                print("Type 'A' to accept all suggested changes")
-                print("Press Enter without input to finish current archive")
-                print("Type 'X' to exit program completely")
-                print("-" * 50)
-            
-            for num, filename in files_dict.items():
-                number_match = self.find_double_numbers(filename)
-                if number_match:
-                    new_name = self.suggest_new_name(filename, number_match)
-                    suggested_changes[filename] = new_name
-                    if dry_run:
-                        change_msg = f"Would rename: {filename}\n        to: {new_name}"
-                        print(change_msg)
-                        if changes_log is not None:
-                            changes_log.append(change_msg)
-                    elif not auto_mode:
-                        print(f"{num:3d}. {filename} -> {new_name} (suggested)")
-                elif not auto_mode and not dry_run:
-                    print(f"{num:3d}. {filename}")
-            
-            if dry_run:
+                for filename, new_name in suggested_changes.items():
+                    change_msg = f"Would rename: {filename}\n        to: {new_name}"
+                    print(change_msg)
+                    if changes_log is not None:
+                        changes_log.append(change_msg)
                 if not suggested_changes:
                     print("No changes would be made to this archive.")
                 print("-" * 50)
                 return
-            elif not auto_mode:
-                print("-" * 50)
-            
-            # Process user commands or auto-accept changes
-            files_to_rename = {}
-            files_to_delete = set()
-            
+
             if auto_mode:
+                files_to_rename = dict(suggested_changes)
+                files_to_delete = set()
                 if suggested_changes:
-                    files_to_rename.update(suggested_changes)
-                    logging.info('Auto-accepted %d suggested changes for %s', 
+                    logging.info('Auto-accepted %d suggested changes for %s',
                                len(suggested_changes), archive_path.name)
             else:
-                while True:
-                    command = input("\nEnter command (or press Enter to finish): ").strip().upper()
-                    if not command:
-                        break
-                    
-                    if command == 'X':
-                        logging.info('User requested exit')
-                        print("Exiting program...")
-                        sys.exit(0)
-                    
-                    if command == 'A':
-                        if suggested_changes:
-                            files_to_rename.update(suggested_changes)
-                            print(f"Added {len(suggested_changes)} suggested changes")
-                            continue
-                        else:
-                            print("No suggested changes available")
-                            continue
-                    
-                    # Parse command
-                    parts = command.split()
-                    if len(parts) != 2 or parts[1] not in {'M', 'D'}:
-                        print("Invalid command. Use format: '<number> M' or '<number> D'")
-                        continue
-                    
-                    try:
-                        file_num = int(parts[0])
-                        action = parts[1]
-                        
-                        if file_num not in files_dict:
-                            print("Invalid file number. Please try again.")
-                            continue
-                        
-                        filename = files_dict[file_num]
-                        
-                        if action == 'D':
-                            # Mark file for deletion
-                            files_to_delete.add(filename)
-                            print(f"Marked for deletion: {filename}")
-                            
-                        else:  # action == 'M'
-                            number_match = self.find_double_numbers(filename)
-                            if number_match:
-                                suggested_name = self.suggest_new_name(filename, number_match)
-                                print(f"Suggested new name: {suggested_name}")
-                                use_suggested = input("Use suggested name? (y/n): ").lower()
-                                
-                                if use_suggested == 'y':
-                                    files_to_rename[filename] = suggested_name
-                                else:
-                                    new_name = input("Enter new name: ")
-                                    if new_name:
-                                        files_to_rename[filename] = new_name
-                            else:
-                                new_name = input("Enter new name: ")
-                                if new_name:
-                                    files_to_rename[filename] = new_name
-                    
-                    except ValueError:
-                        print("Please enter a valid number.")
-            
+                files_to_rename, files_to_delete = self._interactive_plan(
+                    archive_path, files_dict, suggested_changes)
+
             # If any changes were requested, process the archive
             if files_to_rename or files_to_delete:
-                if archive_path.suffix.lower() in {'.zip', '.cbz'}:
-                    self._process_zip(archive_path, files_to_rename, files_to_delete)
-                else:
-                    self._process_rar(archive_path, files_to_rename, files_to_delete)
+                self._apply(archive_path, files_to_rename, files_to_delete, zip_ref=src)
             else:
                 logging.info('No changes requested for %s', archive_path)
-            
+
             # Capture changes for this archive
             if changes_log:
                 changes_log.append(f"\n{archive_path}:")
@@ -298,89 +436,142 @@ class ArchiveHandler:
                     changes_log.append(f"{filename} -> {new_name}")
                 for filename in files_to_delete:
                     changes_log.append(f"Marked for deletion: {filename}")
-            
+
         except Exception as e:
             logging.error('Failed to process archive %s: %s', archive_path, e)
             raise
+        finally:
+            if src is not None:
+                src.close()
+
+    def _rewrite_zip(self, zip_ref: zipfile.ZipFile, archive_path: Path,
+                     files_to_rename: Dict[str, str], files_to_delete: set) -> None:
+        """Stream a filtered/renamed copy of an open zip back into place"""
+        tmp_path = None
+        try:
+            # Stream entries from the source archive straight into a
+            # sibling temp archive: no extract-to-disk round trip, and
+            # the original is never overwritten while still being read
+            tmp_file = tempfile.NamedTemporaryFile(suffix='.zip', delete=False,
+                                                   dir=archive_path.parent)
+            tmp_path = Path(tmp_file.name)
+            # Filter out directories and deletions in one pass up
+            # front so the write loop only ever sees entries it keeps
+            keep = [info for info in zip_ref.infolist()
+                    if not info.filename.endswith('/')
+                    and info.filename not in files_to_delete]
+
+            # Resolve every target name up front so the hot loop does
+            # one dict lookup per entry; the hyphen fallback only
+            # applies when a rename was requested, as before
+            rename_map = self._build_rename_map(
+                (info.filename for info in keep), files_to_rename)
+            with zipfile.ZipFile(tmp_file, 'w', zipfile.ZIP_DEFLATED) as new_zip:
+                for info in keep:
+                    filename = info.filename
+                    arcname = rename_map[filename]
+
+                    # Payloads never change in a zip-to-zip rewrite, so
+                    # copy the compressed bytes verbatim: no inflate, no
+                    # re-deflate, no CRC recomputation. Only encrypted
+                    # entries take the transcoding fallback
+                    if not info.flag_bits & 0x1:
+                        _copy_raw(zip_ref, info, new_zip, arcname)
+                        continue
+
+                    compress_type = (zipfile.ZIP_STORED
+                                     if os.path.splitext(arcname)[1].lower() in IMAGE_EXTS
+                                     else zipfile.ZIP_DEFLATED)
 
-    def _process_zip(self, archive_path: Path, files_to_rename: Dict[str, str], files_to_delete: set) -> None:
+                    # Clone the entry metadata and pipe the payload
+                    # through a bounded buffer rather than holding the
+                    # whole decompressed page in memory
+                    new_info = copy.copy(info)
+                    new_info.filename = arcname
+                    new_info.compress_type = compress_type
+                    with zip_ref.open(info) as source, \
+                         new_zip.open(new_info, 'w', force_zip64=True) as target:
+                        _copy_stream(source, target)
+            tmp_file.close()
+
+            # Swap the rewritten archive into place atomically; an open
+            # source handle keeps reading the old inode after the replace
+            os.replace(tmp_path, archive_path)
+            tmp_path = None
+
+        finally:
+            # Remove the partial archive if the rewrite failed
+            if tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
+
+    def _process_zip(self, archive_path: Path, files_to_rename: Dict[str, str],
+                     files_to_delete: set, zip_ref: Optional[zipfile.ZipFile] = None) -> None:
         """Process a ZIP archive"""
-        archive_temp_dir = None
         try:
-            with zipfile.ZipFile(archive_path, 'r') as zip_ref:
-                # Create unique temporary directory for this archive
-                archive_temp_dir = self._create_temp_dir(archive_path)
-                
-                # Extract files (except those marked for deletion)
-                for filename in zip_ref.namelist():
-                    if filename not in files_to_delete:
-                        extract_path = archive_temp_dir / filename
-                        # Create parent directories if they don't exist
-                        extract_path.parent.mkdir(parents=True, exist_ok=True)
-                        
-                        # Skip directories, only extract files
-                        if not filename.endswith('/'):
-                            with zip_ref.open(filename) as source, open(extract_path, 'wb') as target:
-                                shutil.copyfileobj(source, target)
-                
-                # Create new archive and replace the original
-                with zipfile.ZipFile(archive_path, 'w', zipfile.ZIP_DEFLATED) as new_zip:
-                    for root, _, files in os.walk(archive_temp_dir):
-                        for file in files:
-                            file_path = Path(root) / file
-                            arcname = file_path.relative_to(archive_temp_dir)
-                            
-                            if str(arcname) in files_to_rename:
-                                arcname = files_to_rename[str(arcname)]
-                            elif files_to_rename:
-                                arcname = str(arcname).replace('-', '_')
-                            
-                            new_zip.write(file_path, str(arcname))
-                
-                logging.info('Successfully updated archive: %s', archive_path)
-                
+            if zip_ref is not None:
+                # Fast path: reuse the central directory process_archive
+                # already parsed for the listing
+                self._rewrite_zip(zip_ref, archive_path, files_to_rename, files_to_delete)
+            else:
+                with zipfile.ZipFile(archive_path, 'r') as src:
+                    self._rewrite_zip(src, archive_path, files_to_rename, files_to_delete)
+            logging.info('Successfully updated archive: %s', archive_path)
+
         except Exception as e:
             logging.error('Failed to process ZIP archive %s: %s', archive_path, e)
             raise
-        finally:
-            # Cleanup temporary directory for this archive
-            if archive_temp_dir:
-                self._cleanup_temp_dir(archive_temp_dir)
 
     def _process_rar(self, archive_path: Path, files_to_rename: Dict[str, str], files_to_delete: set) -> None:
-        """Process a RAR archive"""
-        archive_temp_dir = None
+        """Process a RAR archive by converting it to CBZ"""
+        tmp_path = None
         try:
             with rarfile.RarFile(archive_path, 'r') as rar_ref:
-                # Create unique temporary directory for this archive
-                archive_temp_dir = self._create_temp_dir(archive_path)
-                
-                # Extract files (except those marked for deletion)
-                for filename in rar_ref.namelist():
-                    if filename not in files_to_delete:
-                        extract_path = archive_temp_dir / filename
-                        # Create parent directories if they don't exist
-                        extract_path.parent.mkdir(parents=True, exist_ok=True)
-                        
-                        # Skip directories, only extract files
-                        if not rar_ref.getinfo(filename).isdir():
-                            rar_ref.extract(filename, str(archive_temp_dir))
-                
-                # Create new CBZ archive and replace the original RAR
+                # Entries that survive the delete plan
+                keep = [info for info in rar_ref.infolist()
+                        if info.filename not in files_to_delete and not info.isdir()]
+
+                # Resolve every target name up front; one dict lookup per
+                # entry in the write loop
+                rename_map = self._build_rename_map(
+                    (info.filename for info in keep), files_to_rename)
+
+                def _target_info(original_name: str) -> zipfile.ZipInfo:
+                    arcname = rename_map[original_name]
+                    zi = zipfile.ZipInfo(arcname)
+                    zi.compress_type = (zipfile.ZIP_STORED
+                                        if os.path.splitext(arcname)[1].lower() in IMAGE_EXTS
+                                        else zipfile.ZIP_DEFLATED)
+                    return zi
+
+                # Stream each entry straight from the RAR into the new
+                # CBZ: no staging directory, so every page is read and
+                # written exactly once instead of write+read+write.
+                # Build the CBZ in a sibling tempfile and swap it into
+                # place, so a crash mid-write never leaves a truncated
+                # archive at the final name
                 new_path = archive_path.with_suffix('.cbz')
-                with zipfile.ZipFile(new_path, 'w', zipfile.ZIP_DEFLATED) as new_zip:
-                    for root, _, files in os.walk(archive_temp_dir):
-                        for file in files:
-                            file_path = Path(root) / file
-                            arcname = file_path.relative_to(archive_temp_dir)
-                            
-                            if str(arcname) in files_to_rename:
-                                arcname = files_to_rename[str(arcname)]
-                            elif files_to_rename:
-                                arcname = str(arcname).replace('-', '_')
-                            
-                            new_zip.write(file_path, str(arcname))
-                
+                tmp_path = new_path.with_suffix(new_path.suffix + '.tmp')
+                with zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_DEFLATED) as new_zip:
+                    if _USE_LIBARCHIVE:
+                        keep_names = {info.filename for info in keep}
+                        with libarchive.file_reader(str(archive_path)) as entries:
+                            for entry in entries:
+                                if entry.pathname not in keep_names:
+                                    continue
+                                with new_zip.open(_target_info(entry.pathname), 'w',
+                                                  force_zip64=True) as target:
+                                    for block in entry.get_blocks():
+                                        target.write(block)
+                    else:
+                        for info in sorted(keep, key=lambda i: i.filename):
+                            with rar_ref.open(info) as source, \
+                                 new_zip.open(_target_info(info.filename), 'w',
+                                              force_zip64=True) as target:
+                                _copy_stream(source, target)
+
+                os.replace(tmp_path, new_path)
+                tmp_path = None
+
                 # Remove the original RAR file after successful conversion
                 archive_path.unlink()
                 logging.info('Successfully converted and updated archive: %s', new_path)
@@ -392,14 +583,46 @@ class ArchiveHandler:
             logging.error('Failed to process RAR archive %s: %s', archive_path, e)
             raise
         finally:
-            # Cleanup temporary directory for this archive
-            if archive_temp_dir:
-                self._cleanup_temp_dir(archive_temp_dir)
+            # Remove the partial CBZ if the conversion failed
+            if tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
+
+def _iter_archives(root: Path, recursive: bool):
+    """
+    Yield CBZ/CBR files under root, matching both suffixes in one
+    scandir walk instead of two glob passes over the same tree
+    """
+    stack = [str(root)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            stack.append(entry.path)
+                    elif entry.name.lower().endswith(('.cbz', '.cbr')):
+                        yield Path(entry.path)
+        except OSError as e:
+            logging.warning('Error scanning directory %s: %s', current, e)
+
+def _process_one(archive_path: Path, auto_mode: bool, dry_run: bool, collect_changes: bool) -> List[str]:
+    """
+    Worker for parallel processing; builds a fresh handler per call so
+    workers never share a temporary directory
+    """
+    changes_log: List[str] = []
+    if collect_changes:
+        changes_log.append(f"\n{archive_path}:")
+    with ArchiveHandler() as handler:
+        try:
+            handler.process_archive(archive_path, auto_mode, dry_run, changes_log)
+        except Exception as e:
+            logging.error('Failed to process %s: %s', archive_path, e)
+    return changes_log
 
 def main():
     """Main execution function"""
-    handler = ArchiveHandler()
-    
     # Check for flags
     auto_mode = '-a' in sys.argv
     dry_run = '-d' in sys.argv
@@ -429,79 +652,87 @@ def main():
         logging.error('Cannot use both auto mode (-a) and dry run (-d) at the same time')
         return
     
-    changes_log = []  # Store all changes for output file
+    # Deterministic temp-dir cleanup even when dispatch raises
+    with ArchiveHandler() as handler:
+        changes_log = []  # Store all changes for output file
     
-    def process_directory(directory: Path):
-        """Helper function to process a directory"""
-        if recursive:
-            # Use rglob for recursive search
-            archive_files = list(directory.rglob('*.cbz')) + list(directory.rglob('*.cbr'))
-        else:
-            # Use glob for single directory
-            archive_files = list(directory.glob('*.cbz')) + list(directory.glob('*.cbr'))
-        
-        if not archive_files:
-            logging.error('No CBZ or CBR files found in directory: %s', directory)
-            return
+        def process_directory(directory: Path):
+            """Helper function to process a directory"""
+            archive_files = list(_iter_archives(directory, recursive))
         
-        logging.info('Found %d archive files in %s', len(archive_files), directory)
+            if not archive_files:
+                logging.error('No CBZ or CBR files found in directory: %s', directory)
+                return
         
-        # Process each archive
-        for archive_path in sorted(archive_files):
-            try:
-                if not dry_run:
+            logging.info('Found %d archive files in %s', len(archive_files), directory)
+
+            if auto_mode or dry_run:
+                # No prompts in these modes, so archives are fully independent;
+                # fan the DEFLATE-heavy work out across cores, capped so we
+                # don't oversubscribe the disk
+                workers = min(8, os.cpu_count() or 1)
+                worker = partial(_process_one, auto_mode=auto_mode, dry_run=dry_run,
+                                 collect_changes=output_file is not None)
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    for archive_log in executor.map(worker, sorted(archive_files)):
+                        changes_log.extend(archive_log)
+                return
+
+            # Process each archive interactively, one at a time
+            for archive_path in sorted(archive_files):
+                try:
                     print(f"\nProcessing: {archive_path}")
-                
-                # Capture changes for this archive
-                if output_file:
-                    changes_log.append(f"\n{archive_path}:")
-                
-                handler.process_archive(archive_path, auto_mode, dry_run, changes_log)
-            except Exception as e:
-                logging.error('Failed to process %s: %s', archive_path, e)
-                continue
+
+                    # Capture changes for this archive
+                    if output_file:
+                        changes_log.append(f"\n{archive_path}:")
+
+                    handler.process_archive(archive_path, auto_mode, dry_run, changes_log)
+                except Exception as e:
+                    logging.error('Failed to process %s: %s', archive_path, e)
+                    continue
     
-    # Get path from command line or use current directory
-    if len(sys.argv) > 1:
-        path = Path(sys.argv[1])
-        if not path.exists():
-            logging.error('Path not found: %s', path)
-            return
-        
-        if path.is_file():
-            # Process single file
-            if not handler.is_supported(path):
-                logging.error('Unsupported file format: %s', path)
+        # Get path from command line or use current directory
+        if len(sys.argv) > 1:
+            path = Path(sys.argv[1])
+            if not path.exists():
+                logging.error('Path not found: %s', path)
                 return
+        
+            if path.is_file():
+                # Process single file
+                if not handler.is_supported(path):
+                    logging.error('Unsupported file format: %s', path)
+                    return
             
-            try:
-                if output_file:
-                    changes_log.append(f"\n{path}:")
-                handler.process_archive(path, auto_mode, dry_run, changes_log)
-            except Exception as e:
-                logging.error('Failed to process archive: %s', e)
-                sys.exit(1)
+                try:
+                    if output_file:
+                        changes_log.append(f"\n{path}:")
+                    handler.process_archive(path, auto_mode, dry_run, changes_log)
+                except Exception as e:
+                    logging.error('Failed to process archive: %s', e)
+                    sys.exit(1)
         
-        elif path.is_dir():
-            # Process directory
-            process_directory(path)
+            elif path.is_dir():
+                # Process directory
+                process_directory(path)
         
-        else:
-            logging.error('Path is neither a file nor a directory: %s', path)
-            return
+            else:
+                logging.error('Path is neither a file nor a directory: %s', path)
+                return
             
-    else:
-        # No argument provided, use current directory
-        process_directory(Path.cwd())
+        else:
+            # No argument provided, use current directory
+            process_directory(Path.cwd())
     
-    # Write changes to output file if specified
-    if output_file and changes_log:
-        try:
-            with open(output_file, 'w') as f:
-                f.write('\n'.join(changes_log))
-            logging.info('Changes written to: %s', output_file)
-        except Exception as e:
-            logging.error('Failed to write changes to output file: %s', e)
+        # Write changes to output file if specified
+        if output_file and changes_log:
+            try:
+                with open(output_file, 'w') as f:
+                    f.write('\n'.join(changes_log))
+                logging.info('Changes written to: %s', output_file)
+            except Exception as e:
+                logging.error('Failed to write changes to output file: %s', e)
 
 if __name__ == "__main__":
     main()